@@ -2,16 +2,19 @@
 # Universidad Militar Nueva Granada - Ingeniería en Telecomunicaciones
 # jose.rugeles@unimilitar.edu.co
 
+import array
 import network
 import time
+import uasyncio as asyncio
 from machine import Pin, I2C
 from ssd1306 import SSD1306_I2C
 
 # Configuración OLED
 WIDTH = 128
 HEIGHT = 32
-i2c = I2C(1, scl=Pin(15), sda=Pin(14), freq=200000)
+i2c = I2C(1, scl=Pin(15), sda=Pin(14), freq=400000)  # Fast-mode I2C (máximo del SSD1306)
 oled = SSD1306_I2C(WIDTH, HEIGHT, i2c)
+oled.invert(True)  # Se configura una sola vez, no en cada actualización
 
 # Configuración WiFi
 wifi = network.WLAN(network.STA_IF)
@@ -27,25 +30,46 @@ while not wifi.isconnected():
 print("Conexión establecida!")
 print("Dirección IP:", wifi.ifconfig()[0])
 
-# Bucle principal
-while True:
-    rssi_values = []
-    
-    # Toma 10 muestras de RSSI
-    for _ in range(10):
-        rssi = wifi.status('rssi')
-        rssi_values.append(rssi)
-        time.sleep(0.2)
-
-    # Calcula el promedio
-    rssi_average = sum(rssi_values) / len(rssi_values)
-    print("Promedio de RSSI:", rssi_average, "dBm")
-    
-    # Visualización OLED
-    oled.fill(0)
-    oled.invert(True)
-    oled.text("RSSI:", 2, 6)
-    oled.text(str(round(rssi_average, 2)) + " dBm", 10, 20)
-    oled.show()
-    
-    time.sleep(2)
+# Buffer circular de muestras (preasignado para no generar basura en el heap)
+# 5 muestras cada 400 ms: misma ventana de 2 s con la mitad de consultas al driver WiFi
+N_MUESTRAS = 5
+PERIODO_MUESTRA_MS = 400
+rssi_buffer = array.array('i', [0] * N_MUESTRAS)
+rssi_suma = 0  # Suma acumulada de las muestras en el buffer
+
+# Tarea de muestreo: toma una muestra de RSSI cada PERIODO_MUESTRA_MS
+async def muestreo():
+    global rssi_suma
+    estado = wifi.status  # Método enlazado una sola vez
+    i = 0
+    while True:
+        rssi = estado('rssi')
+        rssi_suma += rssi - rssi_buffer[i]  # Entra la muestra nueva, sale la más antigua
+        rssi_buffer[i] = rssi
+        i = (i + 1) % N_MUESTRAS
+        await asyncio.sleep_ms(PERIODO_MUESTRA_MS)
+
+# Tarea de visualización: promedia el buffer y actualiza la OLED cada 2 s
+async def visualizacion():
+    ultimo_texto = ""
+    while True:
+        await asyncio.sleep_ms(2000)
+
+        # Calcula el promedio
+        rssi_average = rssi_suma / N_MUESTRAS
+        print("Promedio de RSSI:", rssi_average, "dBm")
+
+        # Visualización OLED (solo si cambia el valor mostrado; show() envía 512 bytes por I2C)
+        texto = str(round(rssi_average, 2)) + " dBm"
+        if texto != ultimo_texto:
+            oled.fill(0)
+            oled.text("RSSI:", 2, 6)
+            oled.text(texto, 10, 20)
+            oled.show()
+            ultimo_texto = texto
+
+async def main():
+    asyncio.create_task(muestreo())
+    await visualizacion()
+
+asyncio.run(main())
@@ -2,31 +2,23 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from matplotlib.lines import Line2D
+from matplotlib.collections import LineCollection
 import sys
-
-# Configuración del backend para evitar problemas en algunos entornos
-plt.switch_backend('TkAgg')  # Cambiar a un backend más estable si es necesario
-
-# Definir las posiciones de los nodos fijos (en 2D)
-nodos_fijos = np.array([[0, 0], [10, 0], [10, 10], [0, 10]])
-
-# Etiquetas para los nodos
-etiquetas_nodos = ['Nodo 1 (0,0)', 'Nodo 2 (10,0)', 'Nodo 3 (10,10)', 'Nodo 4 (0,10)']
-
-# Definir el nodo móvil (inicia en el centro)
-nodo_movil = np.array([5, 5])
-
-# Historial de distancias
-distancias_historicas = {f'R{i+1}': [] for i in range(4)}
-
-# Lista para la trayectoria del nodo móvil (rastro)
-trayectoria_x = []
-trayectoria_y = []
-
-# Generar señales simuladas para el acelerómetro y el giroscopio (como en el segundo código)
-np.random.seed(42)
-acelerometro = 0.5 * np.cumsum(np.random.randn(3, 200), axis=1)  # Más realista con cumsum
-giroscopio = 0.3 * np.cumsum(np.random.randn(3, 200), axis=1)
+import os
+
+try:
+    from numba import njit
+except ImportError:
+    # numba es opcional: sin él, el núcleo numérico se ejecuta como NumPy normal
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda funcion: funcion
+
+# Configuración del backend para evitar problemas en algunos entornos: SIM_BACKEND (ver README.md)
+backend = os.environ.get('SIM_BACKEND')
+if backend:
+    plt.switch_backend(backend)
 
 # Colores para los ejes de los sensores (como en el segundo código)
 COLORES_SENSORES = {
@@ -34,141 +26,200 @@ COLORES_SENSORES = {
     'giroscopio': ['#4575b4', '#91bfdb', '#e0f3f8']
 }
 
-# Función para calcular la distancia entre dos puntos
-def calcular_distancia(p1, p2):
-    return np.sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)
-
-# Crear la figura con GridSpec (como en el primer código)
-fig = plt.figure(figsize=(12, 6))
-grid = plt.GridSpec(3, 4, wspace=0.3, hspace=0.3)
-
-# Subplot principal (izquierda) - ocupa 3 filas y 3 columnas
-ax_main = fig.add_subplot(grid[:, :3])
-
-# Subplots a la derecha (apilados verticalmente) - cada uno ocupa 1 fila y 1 columna
-ax_right1 = fig.add_subplot(grid[0, 3])  # Distancias históricas
-ax_right2 = fig.add_subplot(grid[1, 3])  # Acelerómetro
-ax_right3 = fig.add_subplot(grid[2, 3])  # Giroscopio
-
-# Configurar el subplot principal
-ax_main.set_xlim(-1, 11)
-ax_main.set_ylim(-1, 11)
-ax_main.set_xlabel('Eje X')
-ax_main.set_ylabel('Eje Y')
-ax_main.set_title('Simulador de Trilateración - Comunicaciones Digitales UMNG - jose.rugeles@unimilitar.edu.co')
-
-# Graficar los nodos fijos
-ax_main.scatter(nodos_fijos[:, 0], nodos_fijos[:, 1], color='red', label='Nodos Fijos', s=150)
-
-# Etiquetas para los nodos fijos
-for i, nodo_fijo in enumerate(nodos_fijos):
-    ax_main.text(nodo_fijo[0] + 0.1, nodo_fijo[1] + 0.1, etiquetas_nodos[i], fontsize=12, ha="left")
-
-# Graficar el nodo móvil
-nodo_movil_plot, = ax_main.plot([], [], 'bo', label='Nodo Móvil', markersize=12)
-
-# Graficar los vectores de distancia (inicialmente vacíos)
-vectores = [ax_main.plot([], [], 'k--')[0] for _ in nodos_fijos]
-
-# Traza de la trayectoria del nodo móvil (en gris)
-trayectoria, = ax_main.plot([], [], 'gray', alpha=0.3)
-
-# Configurar los subplots de acelerómetro y giroscopio (como en el segundo código)
-# Acelerómetro
-ax_right2.set_xlim(0, 200)
-ax_right2.set_ylim(-8, 8)  # Rango ajustado para las señales simuladas
-ax_right2.set_title('Acelerómetro')
-ax_right2.set_xlabel('Tiempo')
-ax_right2.set_ylabel('Valor')
-ax_right2.grid(True, alpha=0.3)
-
-# Giroscopio
-ax_right3.set_xlim(0, 200)
-ax_right3.set_ylim(-8, 8)
-ax_right3.set_title('Giroscopio')
-ax_right3.set_xlabel('Tiempo')
-ax_right3.set_ylabel('Valor')
-ax_right3.grid(True, alpha=0.3)
-
-# Inicializar las gráficas para los subgráficos de acelerómetro y giroscopio (tres ejes)
-acelerometro_plots = []
-giroscopio_plots = []
-for i in range(3):
-    acelerometro_plots.append(ax_right2.plot([], [], label=f'Acelerómetro {["X", "Y", "Z"][i]}', color=COLORES_SENSORES['acelerometro'][i])[0])
-    giroscopio_plots.append(ax_right3.plot([], [], label=f'Giroscopio {["X", "Y", "Z"][i]}', color=COLORES_SENSORES['giroscopio'][i])[0])
-
-# Agregar leyendas estáticas (como en el segundo código, pero sin actualizar en cada frame)
-ax_right2.legend()
-ax_right3.legend()
-
-# Configurar el subplot de distancias históricas
-ax_right1.axis('off')
-ax_right1.set_title('Distancias Históricas', fontsize=12)
-
-# Función de actualización de la animación
-def actualizar(frame):
-    global trayectoria_x, trayectoria_y
+# Máximo de puntos por señal de sensor a dibujar; historiales más largos se submuestrean
+MAX_PUNTOS_GRAFICA = 500
 
+@njit(cache=True)
+def _actualizar_estado(frame, nodos_fijos, trayectoria):
+    """Calcula la posición del nodo móvil, las diferencias y las distancias a los nodos fijos."""
     # Mover el nodo móvil a lo largo de una trayectoria circular (como en el primer código)
-    nodo_movil[0] = 5 + 3 * np.sin(frame * 0.1)
-    nodo_movil[1] = 5 + 3 * np.cos(frame * 0.1)
-    
-    # Actualizar la posición del nodo móvil en la gráfica
-    nodo_movil_plot.set_data([nodo_movil[0]], [nodo_movil[1]])
-
-    # Agregar las coordenadas actuales a la trayectoria
-    trayectoria_x.append(nodo_movil[0])
-    trayectoria_y.append(nodo_movil[1])
-
-    # Calcular las distancias a cada nodo fijo
-    distancias = [calcular_distancia(nodo_movil, nodo_fijo) for nodo_fijo in nodos_fijos]
-    
-    # Actualizar los vectores de distancia desde cada nodo fijo
-    for i, nodo_fijo in enumerate(nodos_fijos):
-        vectores[i].set_data([nodo_fijo[0], nodo_movil[0]], [nodo_fijo[1], nodo_movil[1]])
-
-    # Actualizar las distancias históricas
-    for i, distancia in enumerate(distancias):
-        distancias_historicas[f'R{i+1}'].append(distancia)
-
-    # Borrar las etiquetas anteriores (excepto las de los nodos fijos)
-    for label in ax_main.texts[4:]:  # Las primeras 4 son las etiquetas de los nodos
-        label.set_visible(False)
-
-    # Mostrar solo los nombres de los vectores sin las distancias
-    for i, distancia in enumerate(distancias):
-        ax_main.text((nodo_movil[0] + nodos_fijos[i][0]) / 2 + 0.2, 
-                     (nodo_movil[1] + nodos_fijos[i][1]) / 2, 
-                     f'R{i+1}', fontsize=10)
-
-    # Actualizar las distancias históricas en el subplot de la derecha
-    texto_historial = '\n'.join([f'{k}: {v[-1]:.2f}m' for k, v in distancias_historicas.items()])
-    ax_right1.clear()
-    ax_right1.axis('off')
-    ax_right1.set_title('Distancias Históricas', fontsize=12)
-    ax_right1.text(0.1, 0.8, texto_historial, fontsize=12, verticalalignment='top', horizontalalignment='left')
-
-    # Actualizar la trayectoria en gris
-    trayectoria.set_data(trayectoria_x, trayectoria_y)
-
-    # Actualizar las señales del acelerómetro y giroscopio (tres ejes)
-    if frame > 0:  # Evitar arrays vacíos cuando frame=0
-        x_data = np.arange(frame)
-        for i in range(3):
-            acelerometro_plots[i].set_data(x_data, acelerometro[i, :frame])
-            giroscopio_plots[i].set_data(x_data, giroscopio[i, :frame])
-    else:
-        for i in range(3):
-            acelerometro_plots[i].set_data([], [])
-            giroscopio_plots[i].set_data([], [])
-
-    return [nodo_movil_plot, *vectores, trayectoria, *acelerometro_plots, *giroscopio_plots]
-
-# Crear la animación
-ani = animation.FuncAnimation(fig, actualizar, frames=200, interval=100, blit=False)
-
-# Ajustar los márgenes manualmente si es necesario
-plt.subplots_adjust(left=0.1, right=0.9, top=0.9, bottom=0.1)
-
-# Mostrar la animación
-plt.show()
\ No newline at end of file
+    trayectoria[frame, 0] = 5 + 3 * np.sin(frame * 0.1)
+    trayectoria[frame, 1] = 5 + 3 * np.cos(frame * 0.1)
+    nodo_movil = trayectoria[frame]
+
+    # Calcular las distancias a todos los nodos fijos en una sola operación vectorizada
+    diffs = nodos_fijos - nodo_movil
+    distancias = np.sqrt(diffs[:, 0]**2 + diffs[:, 1]**2)
+    return nodo_movil, diffs, distancias
+
+class SimuladorOutdoor:
+    def __init__(self):
+        # Número de frames de la animación
+        self.num_frames = 200
+
+        # Definir las posiciones de los nodos fijos (en 2D)
+        self.nodos_fijos = np.array([[0, 0], [10, 0], [10, 10], [0, 10]], dtype=float)
+
+        # Etiquetas para los nodos
+        self.etiquetas_nodos = ['Nodo 1 (0,0)', 'Nodo 2 (10,0)', 'Nodo 3 (10,10)', 'Nodo 4 (0,10)']
+
+        # Definir el nodo móvil (inicia en el centro)
+        self.nodo_movil = np.array([5.0, 5.0])
+
+        # Historial de distancias (una fila por nodo, una columna por frame)
+        self.distancias_historicas = np.empty((len(self.nodos_fijos), self.num_frames))
+        self.nombres_distancias = [f'R{i+1}' for i in range(len(self.nodos_fijos))]
+
+        # Buffer preasignado para la trayectoria del nodo móvil (rastro), una fila por frame
+        self.trayectoria_xy = np.empty((self.num_frames, 2))
+
+        # Generar señales simuladas para el acelerómetro y el giroscopio (como en el segundo código)
+        # float32 basta para graficar y reduce a la mitad la memoria y los datos que se pasan a matplotlib
+        np.random.seed(42)
+        self.acelerometro = (0.5 * np.cumsum(np.random.randn(3, self.num_frames), axis=1)).astype(np.float32)  # Más realista con cumsum
+        self.giroscopio = (0.3 * np.cumsum(np.random.randn(3, self.num_frames), axis=1)).astype(np.float32)
+
+        # Crear la figura y los ejes
+        self.crear_interfaz()
+
+    def crear_interfaz(self):
+        """Crea la interfaz gráfica del simulador."""
+        # Crear la figura con GridSpec (como en el primer código)
+        self.fig = plt.figure(figsize=(12, 6))
+        self.grid = plt.GridSpec(3, 4, wspace=0.3, hspace=0.3)
+
+        # Subplot principal (izquierda) - ocupa 3 filas y 3 columnas
+        self.ax_main = self.fig.add_subplot(self.grid[:, :3])
+
+        # Subplots a la derecha (apilados verticalmente) - cada uno ocupa 1 fila y 1 columna
+        self.ax_right1 = self.fig.add_subplot(self.grid[0, 3])  # Distancias históricas
+        self.ax_right2 = self.fig.add_subplot(self.grid[1, 3])  # Acelerómetro
+        self.ax_right3 = self.fig.add_subplot(self.grid[2, 3])  # Giroscopio
+
+        # Configurar el subplot principal
+        self.ax_main.set_xlim(-1, 11)
+        self.ax_main.set_ylim(-1, 11)
+        self.ax_main.set_xlabel('Eje X')
+        self.ax_main.set_ylabel('Eje Y')
+        self.ax_main.set_title('Simulador de Trilateración - Comunicaciones Digitales UMNG - jose.rugeles@unimilitar.edu.co')
+
+        # Graficar los nodos fijos
+        self.ax_main.scatter(self.nodos_fijos[:, 0], self.nodos_fijos[:, 1], color='red', label='Nodos Fijos', s=150)
+
+        # Etiquetas para los nodos fijos
+        for i, nodo_fijo in enumerate(self.nodos_fijos):
+            self.ax_main.text(nodo_fijo[0] + 0.1, nodo_fijo[1] + 0.1, self.etiquetas_nodos[i], fontsize=12, ha="left")
+
+        # Graficar el nodo móvil
+        self.nodo_movil_plot, = self.ax_main.plot([], [], 'bo', label='Nodo Móvil', markersize=12)
+
+        # Graficar los vectores de distancia (inicialmente vacíos)
+        self.vectores = [self.ax_main.plot([], [], 'k--')[0] for _ in self.nodos_fijos]
+
+        # Coordenadas de los segmentos (nodo fijo -> nodo móvil); la columna 0 es fija
+        self.segmentos_x = np.column_stack((self.nodos_fijos[:, 0], self.nodos_fijos[:, 0]))
+        self.segmentos_y = np.column_stack((self.nodos_fijos[:, 1], self.nodos_fijos[:, 1]))
+
+        # Etiquetas R1..R4 de los vectores (se reposicionan en cada frame)
+        self.etiquetas_vectores = [self.ax_main.text(0, 0, nombre, fontsize=10)
+                                   for nombre in self.nombres_distancias]
+        self.desplazamiento_etiquetas = np.array([0.2, 0])
+
+        # Traza de la trayectoria del nodo móvil (en gris)
+        self.trayectoria, = self.ax_main.plot([], [], 'gray', alpha=0.3)
+
+        # Configurar subplots secundarios
+        self.configurar_subplots()
+
+    def configurar_subplots(self):
+        """Configura los subplots de distancias, acelerómetro y giroscopio."""
+        # Configurar los subplots de acelerómetro y giroscopio (como en el segundo código)
+        # Acelerómetro
+        self.ax_right2.set_xlim(0, self.num_frames)
+        self.ax_right2.set_ylim(-8, 8)  # Rango ajustado para las señales simuladas
+        self.ax_right2.set_title('Acelerómetro')
+        self.ax_right2.set_xlabel('Tiempo')
+        self.ax_right2.set_ylabel('Valor')
+        self.ax_right2.grid(True, alpha=0.3)
+
+        # Giroscopio
+        self.ax_right3.set_xlim(0, self.num_frames)
+        self.ax_right3.set_ylim(-8, 8)
+        self.ax_right3.set_title('Giroscopio')
+        self.ax_right3.set_xlabel('Tiempo')
+        self.ax_right3.set_ylabel('Valor')
+        self.ax_right3.grid(True, alpha=0.3)
+
+        # Segmentos precalculados (eje, muestra, [t, valor]) sobre un eje temporal fijo
+        x_full = np.arange(self.num_frames, dtype=np.float32)
+        self.segmentos_acelerometro = np.stack([np.broadcast_to(x_full, self.acelerometro.shape),
+                                                self.acelerometro], axis=-1)
+        self.segmentos_giroscopio = np.stack([np.broadcast_to(x_full, self.giroscopio.shape),
+                                              self.giroscopio], axis=-1)
+
+        # Inicializar las gráficas para los subgráficos de acelerómetro y giroscopio (tres ejes en un solo artista)
+        self.acelerometro_plot = LineCollection([], colors=COLORES_SENSORES['acelerometro'])
+        self.giroscopio_plot = LineCollection([], colors=COLORES_SENSORES['giroscopio'])
+        self.ax_right2.add_collection(self.acelerometro_plot)
+        self.ax_right3.add_collection(self.giroscopio_plot)
+
+        # Agregar leyendas estáticas (como en el segundo código, pero sin actualizar en cada frame)
+        self.ax_right2.legend(handles=[Line2D([], [], color=color, label=f'Acelerómetro {eje}')
+                                       for eje, color in zip(['X', 'Y', 'Z'], COLORES_SENSORES['acelerometro'])])
+        self.ax_right3.legend(handles=[Line2D([], [], color=color, label=f'Giroscopio {eje}')
+                                       for eje, color in zip(['X', 'Y', 'Z'], COLORES_SENSORES['giroscopio'])])
+
+        # Configurar el subplot de distancias históricas
+        self.ax_right1.axis('off')
+        self.ax_right1.set_title('Distancias Históricas', fontsize=12)
+        self.texto_historial_plot = self.ax_right1.text(0.1, 0.8, '', fontsize=12, verticalalignment='top',
+                                                        horizontalalignment='left')
+
+    def actualizar(self, frame):
+        """Actualiza la animación."""
+        # Posición, diferencias y distancias a los nodos fijos (compilado con numba si está disponible)
+        self.nodo_movil, diffs, distancias = _actualizar_estado(frame, self.nodos_fijos, self.trayectoria_xy)
+
+        # Actualizar la posición del nodo móvil en la gráfica
+        self.nodo_movil_plot.set_data([self.nodo_movil[0]], [self.nodo_movil[1]])
+
+        # Actualizar los vectores de distancia desde cada nodo fijo
+        self.segmentos_x[:, 1] = self.nodo_movil[0]
+        self.segmentos_y[:, 1] = self.nodo_movil[1]
+        for i, vector in enumerate(self.vectores):
+            vector.set_data(self.segmentos_x[i], self.segmentos_y[i])
+
+        # Actualizar las distancias históricas
+        self.distancias_historicas[:, frame] = distancias
+
+        # Mostrar solo los nombres de los vectores en el punto medio de cada uno
+        puntos_medios = self.nodos_fijos - diffs / 2 + self.desplazamiento_etiquetas
+        for etiqueta, punto_medio in zip(self.etiquetas_vectores, puntos_medios):
+            etiqueta.set_position(punto_medio)
+
+        # Actualizar las distancias históricas en el subplot de la derecha
+        texto_historial = '\n'.join([f'{nombre}: {distancia:.2f}m'
+                                     for nombre, distancia in zip(self.nombres_distancias, distancias)])
+        self.texto_historial_plot.set_text(texto_historial)
+
+        # Actualizar la trayectoria en gris
+        self.trayectoria.set_data(self.trayectoria_xy[:frame + 1, 0], self.trayectoria_xy[:frame + 1, 1])
+
+        # Actualizar las señales del acelerómetro y giroscopio (tres ejes)
+        if frame > 0:  # Evitar segmentos vacíos cuando frame=0
+            paso = -(-frame // MAX_PUNTOS_GRAFICA)  # ceil: como máximo MAX_PUNTOS_GRAFICA puntos
+            self.acelerometro_plot.set_segments(self.segmentos_acelerometro[:, :frame:paso])
+            self.giroscopio_plot.set_segments(self.segmentos_giroscopio[:, :frame:paso])
+        else:
+            self.acelerometro_plot.set_segments([])
+            self.giroscopio_plot.set_segments([])
+
+        return [self.nodo_movil_plot, *self.vectores, *self.etiquetas_vectores, self.trayectoria,
+                self.texto_historial_plot, self.acelerometro_plot, self.giroscopio_plot]
+
+    def iniciar(self):
+        """Inicia la animación."""
+        # Crear la animación (sin repetir: se detiene en el último frame)
+        self.ani = animation.FuncAnimation(self.fig, self.actualizar, frames=self.num_frames,
+                                           interval=100, blit=True, repeat=False)
+
+        # Ajustar los márgenes manualmente si es necesario
+        plt.subplots_adjust(left=0.1, right=0.9, top=0.9, bottom=0.1)
+
+        # Mostrar la animación
+        plt.show()
+
+# Crear y ejecutar el simulador
+if __name__ == "__main__":
+    simulador = SimuladorOutdoor()
+    simulador.iniciar()
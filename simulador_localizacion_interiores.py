@@ -16,10 +16,14 @@ import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from matplotlib.lines import Line2D
 from matplotlib.patches import Rectangle, Circle
+from matplotlib.collections import LineCollection, PatchCollection
 import sys
+import os
 
-# Configuración del backend
-plt.switch_backend('TkAgg')
+# Configuración del backend (opcional, variable de entorno SIM_BACKEND)
+backend = os.environ.get('SIM_BACKEND')
+if backend:
+    plt.switch_backend(backend)
 
 class SimuladorLocalizacionInteriores:
     def __init__(self):
@@ -54,40 +58,90 @@ class SimuladorLocalizacionInteriores:
             [1, self.alto-1]    # Esquina superior izquierda (pasillo)
         ])
         
+        # Trilateración lineal: restando la ecuación del último AP queda A p = b, con
+        # A = 2 (x_N - x_i) fija por la geometría, así que su pseudoinversa se calcula una vez
+        self.normas_cuadradas = np.sum(self.nodos_fijos**2, axis=1)
+        self.pseudoinversa_A = np.linalg.pinv(2 * (self.nodos_fijos[-1] - self.nodos_fijos[:-1]))
+        
         # Etiquetas para los nodos
         self.etiquetas_nodos = ['AP1', 'AP2', 'AP3', 'AP4']
         
         # Definir el nodo móvil (inicia en el centro del pasillo)
         self.nodo_movil = np.array([self.ancho/2, self.alto/2])
         
+        # Límites del área (para acotar la posición estimada)
+        self.limites_area = np.array([self.ancho, self.alto])
+        
         # Parámetros del modelo de propagación
         self.n = 2.5  # Exponente de pérdida de propagación (típico para interiores)
         self.sigma = 3.0  # Desviación estándar del ruido (dB)
+        self.ventana_rssi = 8  # Frames de RSSI promediados antes de estimar la posición
+        
+        # Número de frames de la animación
+        self.num_frames = 200
         
-        # Historial de distancias y RSSI
-        self.distancias_historicas = {f'R{i+1}': [] for i in range(len(self.nodos_fijos))}
-        self.rssi_historicos = {f'RSSI{i+1}': [] for i in range(len(self.nodos_fijos))}
+        # Historial de distancias y RSSI (una fila por AP, una columna por frame)
+        self.distancias_historicas = np.empty((len(self.nodos_fijos), self.num_frames))
+        self.rssi_historicos = np.empty((len(self.nodos_fijos), self.num_frames))
+        self.tiempo = np.arange(self.num_frames)
         
-        # Lista para la trayectoria
-        self.trayectoria_x = []
-        self.trayectoria_y = []
+        # Trayectoria precalculada que sigue los pasillos, una fila por frame
+        self.tabla_trayectoria = self.generar_trayectoria()
+        
+        # Ruido de RSSI precalculado (reproducible), una fila por frame y una columna por AP
+        self.rng = np.random.default_rng(42)
+        self.ruido_rssi = self.rng.normal(0, self.sigma, size=(self.num_frames, len(self.nodos_fijos)))
         
         # Crear la figura y los ejes
         self.crear_interfaz()
     
+    def generar_trayectoria(self):
+        """Precalcula la trayectoria rectangular del nodo móvil por los pasillos."""
+        # Tres tramos de igual longitud; el último absorbe el resto si num_frames no es múltiplo de 4
+        tramo = self.num_frames // 4
+        avance = np.arange(tramo) / tramo
+        ultimo = self.num_frames - 3 * tramo
+        avance_ultimo = np.arange(ultimo) / ultimo
+        tabla = np.empty((self.num_frames, 2))
+        
+        # Movimiento horizontal en el pasillo inferior
+        tabla[:tramo, 0] = 1 + avance * (self.ancho - 2)
+        tabla[:tramo, 1] = 1
+        # Movimiento vertical en el pasillo derecho
+        tabla[tramo:2*tramo, 0] = self.ancho - 1
+        tabla[tramo:2*tramo, 1] = 1 + avance * (self.alto - 2)
+        # Movimiento horizontal en el pasillo superior
+        tabla[2*tramo:3*tramo, 0] = self.ancho - 1 - avance * (self.ancho - 2)
+        tabla[2*tramo:3*tramo, 1] = self.alto - 1
+        # Movimiento vertical en el pasillo izquierdo
+        tabla[3*tramo:, 0] = 1
+        tabla[3*tramo:, 1] = self.alto - 1 - avance_ultimo * (self.alto - 2)
+        return tabla
+    
     def calcular_distancia_con_obstaculos(self, p1, p2):
-        """Calcula la distancia considerando obstáculos."""
+        """Calcula la distancia considerando obstáculos (p2 puede ser un arreglo de puntos)."""
         # Por ahora, implementación simple. Se puede mejorar con algoritmos de pathfinding
-        return np.sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)
+        return np.linalg.norm(np.asarray(p2) - p1, axis=-1)
     
-    def calcular_rssi(self, distancia):
-        """Calcula el RSSI basado en el modelo de propagación para interiores."""
+    def calcular_rssi(self, distancia, frame):
+        """Calcula el RSSI basado en el modelo de propagación para interiores (vectorizado)."""
         # RSSI = -10 * n * log10(d) + X
-        # donde n es el exponente de pérdida y X es el ruido
-        rssi_base = -10 * self.n * np.log10(distancia)
-        ruido = np.random.normal(0, self.sigma)
+        # donde n es el exponente de pérdida y X es el ruido (precalculado para el frame)
+        # El modelo se define para d >= 1 m (distancia de referencia); evita log10(0) sobre un AP
+        rssi_base = -10 * self.n * np.log10(np.maximum(distancia, 1.0))
+        ruido = self.ruido_rssi[frame]
         return rssi_base + ruido
     
+    def distancia_desde_rssi(self, rssi):
+        """Invierte el modelo de propagación para estimar la distancia a partir del RSSI."""
+        return 10 ** (-rssi / (10 * self.n))
+    
+    def localizar(self, distancias):
+        """Estima la posición del móvil por trilateración lineal (mínimos cuadrados en forma cerrada)."""
+        b = (distancias[:-1]**2 - distancias[-1]**2
+             - self.normas_cuadradas[:-1] + self.normas_cuadradas[-1])
+        return self.pseudoinversa_A @ b
+    
     def crear_interfaz(self):
         """Crea la interfaz gráfica del simulador."""
         self.fig = plt.figure(figsize=(15, 8))
@@ -107,9 +161,8 @@ class SimuladorLocalizacionInteriores:
         self.ax_main.set_ylabel('Y (m)')
         self.ax_main.set_title('Simulador de Localización en Edificio con Pasillos')
         
-        # Dibujar paredes y obstáculos
-        for pared in self.paredes:
-            self.ax_main.add_patch(pared)
+        # Dibujar paredes y obstáculos (una sola colección estática)
+        self.ax_main.add_collection(PatchCollection(self.paredes, match_original=True))
         
         # Graficar los nodos fijos
         self.ax_main.scatter(self.nodos_fijos[:, 0], self.nodos_fijos[:, 1], 
@@ -123,9 +176,15 @@ class SimuladorLocalizacionInteriores:
         # Inicializar elementos móviles
         self.nodo_movil_plot, = self.ax_main.plot([], [], 'bo', 
                                                  label='Dispositivo Móvil', markersize=12)
-        self.vectores = [self.ax_main.plot([], [], 'k--')[0] 
-                        for _ in self.nodos_fijos]
+        # Vectores de distancia: un solo artista con un segmento (AP -> móvil) por AP
+        self.segmentos_vectores = np.empty((len(self.nodos_fijos), 2, 2))
+        self.segmentos_vectores[:, 0] = self.nodos_fijos
+        self.vectores = LineCollection([], colors='k', linestyles='--')
+        self.ax_main.add_collection(self.vectores)
         self.trayectoria, = self.ax_main.plot([], [], 'gray', alpha=0.3)
+        self.estimacion_plot, = self.ax_main.plot([], [], 'rx', 
+                                                 label='Posición Estimada', markersize=10,
+                                                 markeredgewidth=2)
         
         # Configurar subplots secundarios
         self.configurar_subplots()
@@ -135,19 +194,27 @@ class SimuladorLocalizacionInteriores:
     
     def configurar_subplots(self):
         """Configura los subplots secundarios."""
+        # Límites fijos: evitan recalcular la escala en cada frame y permiten el blit
+        diagonal = np.hypot(self.ancho, self.alto)
+        
         # Subplot de RSSI
+        self.ax_rssi.set_xlim(0, self.num_frames)
+        self.ax_rssi.set_ylim(-10 * self.n * np.log10(diagonal) - 4 * self.sigma, 4 * self.sigma)
         self.ax_rssi.set_title('RSSI en tiempo real')
         self.ax_rssi.set_xlabel('Tiempo')
         self.ax_rssi.set_ylabel('RSSI (dBm)')
         self.ax_rssi.grid(True)
         
         # Subplot de distancias
+        self.ax_distancias.set_xlim(0, self.num_frames)
+        self.ax_distancias.set_ylim(0, diagonal)
         self.ax_distancias.set_title('Distancias a los APs')
         self.ax_distancias.set_xlabel('Tiempo')
         self.ax_distancias.set_ylabel('Distancia (m)')
         self.ax_distancias.grid(True)
         
-        # Inicializar líneas para RSSI y distancias
+        # Inicializar líneas para RSSI y distancias (un color fijo por AP)
+        self.colores = [plt.cm.tab10(i) for i in range(len(self.nodos_fijos))]
         self.rssi_lines = []
         self.distancia_lines = []
         
@@ -155,13 +222,13 @@ class SimuladorLocalizacionInteriores:
             # Líneas para RSSI
             rssi_line, = self.ax_rssi.plot([], [], 
                                           label=f'AP{i+1}', 
-                                          color=plt.cm.tab10(i))
+                                          color=self.colores[i])
             self.rssi_lines.append(rssi_line)
             
             # Líneas para distancias
             dist_line, = self.ax_distancias.plot([], [], 
                                                label=f'R{i+1}', 
-                                               color=plt.cm.tab10(i))
+                                               color=self.colores[i])
             self.distancia_lines.append(dist_line)
         
         self.ax_rssi.legend()
@@ -169,68 +236,50 @@ class SimuladorLocalizacionInteriores:
     
     def actualizar(self, frame):
         """Actualiza la animación."""
-        # Mover el nodo móvil por los pasillos
-        # Trayectoria que sigue los pasillos
-        if frame < 50:
-            # Movimiento horizontal en el pasillo inferior
-            self.nodo_movil[0] = 1 + (frame / 50) * (self.ancho - 2)
-            self.nodo_movil[1] = 1
-        elif frame < 100:
-            # Movimiento vertical en el pasillo derecho
-            self.nodo_movil[0] = self.ancho - 1
-            self.nodo_movil[1] = 1 + ((frame - 50) / 50) * (self.alto - 2)
-        elif frame < 150:
-            # Movimiento horizontal en el pasillo superior
-            self.nodo_movil[0] = self.ancho - 1 - ((frame - 100) / 50) * (self.ancho - 2)
-            self.nodo_movil[1] = self.alto - 1
-        else:
-            # Movimiento vertical en el pasillo izquierdo
-            self.nodo_movil[0] = 1
-            self.nodo_movil[1] = self.alto - 1 - ((frame - 150) / 50) * (self.alto - 2)
+        # Mover el nodo móvil por los pasillos (trayectoria precalculada)
+        self.nodo_movil = self.tabla_trayectoria[frame]
         
         # Actualizar posición del nodo móvil
         self.nodo_movil_plot.set_data([self.nodo_movil[0]], [self.nodo_movil[1]])
         
         # Actualizar trayectoria
-        self.trayectoria_x.append(self.nodo_movil[0])
-        self.trayectoria_y.append(self.nodo_movil[1])
-        self.trayectoria.set_data(self.trayectoria_x, self.trayectoria_y)
-        
-        # Calcular distancias y RSSI
-        for i, nodo_fijo in enumerate(self.nodos_fijos):
-            # Calcular distancia
-            distancia = self.calcular_distancia_con_obstaculos(self.nodo_movil, nodo_fijo)
-            self.distancias_historicas[f'R{i+1}'].append(distancia)
-            
-            # Calcular RSSI
-            rssi = self.calcular_rssi(distancia)
-            self.rssi_historicos[f'RSSI{i+1}'].append(rssi)
-            
-            # Actualizar vector de distancia
-            self.vectores[i].set_data([nodo_fijo[0], self.nodo_movil[0]], 
-                                     [nodo_fijo[1], self.nodo_movil[1]])
-            
+        self.trayectoria.set_data(self.tabla_trayectoria[:frame + 1, 0],
+                                  self.tabla_trayectoria[:frame + 1, 1])
+        
+        # Calcular distancias y RSSI a todos los APs en un solo paso vectorizado
+        distancias = self.calcular_distancia_con_obstaculos(self.nodo_movil, self.nodos_fijos)
+        rssi = self.calcular_rssi(distancias, frame)
+        
+        self.distancias_historicas[:, frame] = distancias
+        self.rssi_historicos[:, frame] = rssi
+        
+        # Estimar la posición con el RSSI promediado en los últimos frames (reduce el ruido)
+        # y limitarla al área del edificio
+        inicio = max(0, frame + 1 - self.ventana_rssi)
+        rssi_suavizado = self.rssi_historicos[:, inicio:frame + 1].mean(axis=1)
+        estimacion = self.localizar(self.distancia_desde_rssi(rssi_suavizado))
+        np.clip(estimacion, 0, self.limites_area, out=estimacion)
+        self.estimacion_plot.set_data([estimacion[0]], [estimacion[1]])
+        tiempo = self.tiempo[:frame + 1]
+        
+        # Actualizar vectores de distancia
+        self.segmentos_vectores[:, 1] = self.nodo_movil
+        self.vectores.set_segments(self.segmentos_vectores)
+        
+        for i in range(len(self.nodos_fijos)):
             # Actualizar gráfica de RSSI
-            self.rssi_lines[i].set_data(range(len(self.rssi_historicos[f'RSSI{i+1}'])), 
-                                      self.rssi_historicos[f'RSSI{i+1}'])
+            self.rssi_lines[i].set_data(tiempo, self.rssi_historicos[i, :frame + 1])
             
             # Actualizar gráfica de distancias
-            self.distancia_lines[i].set_data(range(len(self.distancias_historicas[f'R{i+1}'])), 
-                                           self.distancias_historicas[f'R{i+1}'])
-        
-        # Actualizar límites de los subplots
-        self.ax_rssi.relim()
-        self.ax_rssi.autoscale_view()
-        self.ax_distancias.relim()
-        self.ax_distancias.autoscale_view()
+            self.distancia_lines[i].set_data(tiempo, self.distancias_historicas[i, :frame + 1])
         
-        return [self.nodo_movil_plot, *self.vectores, self.trayectoria, 
+        return [self.nodo_movil_plot, self.estimacion_plot, self.vectores, self.trayectoria, 
                 *self.rssi_lines, *self.distancia_lines]
     
     def iniciar(self):
         """Inicia la animación."""
         ani = animation.FuncAnimation(self.fig, self.actualizar, 
-                                    frames=200, interval=50, blit=True)
+                                    frames=self.num_frames, interval=50, blit=True)
         plt.show()
 
 # Crear y ejecutar el simulador
@@ -5,7 +5,7 @@ Este código implementa un simulador de trilateración con ocho nodos fijos
 dispuestos en forma circular equiespaciados y un nodo móvil externo.
 
 Características:
-1. Ocho nodos de referencia en configuración circular
+1. Ocho nodos de referencia en configuración circular (número configurable por línea de comandos)
 2. Nodo móvil con trayectoria exterior
 3. Visualización de distancias y RSSI
 4. Sensores inerciales simulados
@@ -18,11 +18,66 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from matplotlib.lines import Line2D
+from matplotlib.collections import LineCollection
 from matplotlib.widgets import CheckButtons
 import sys
+import os
+import math
 
-# Configuración del backend para evitar problemas en algunos entornos
-plt.switch_backend('TkAgg')
+try:
+    from numba import njit
+    NUMBA_DISPONIBLE = True
+except ImportError:
+    # numba es opcional: sin él se usa siempre la ruta vectorizada con NumPy
+    NUMBA_DISPONIBLE = False
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda funcion: funcion
+
+# Backend de matplotlib elegido con SIM_BACKEND; sin definir se usa el predeterminado
+backend = os.environ.get('SIM_BACKEND')
+if backend:
+    plt.switch_backend(backend)
+
+# A partir de este número de nodos (argumento num_nodos) se usa el núcleo compilado con numba
+MIN_NODOS_NUMBA = 16
+
+# Máximo de nodos con línea propia en el panel de información y con etiqueta en el gráfico
+MAX_NODOS_DETALLE = 8
+
+@njit(fastmath=True, cache=True)
+def _nucleo_direction_finding(nodos, movil, ruido_distancia, ruido_rssi,
+                              potencia_tx, perdida_ref, factor_perdida,
+                              distancias_reales, distancias_medidas, direcciones, rssi):
+    """Calcula distancias, direcciones, RSSI y el vector resultante ponderado en una sola pasada."""
+    rx = 0.0
+    ry = 0.0
+    for i in range(nodos.shape[0]):
+        dx = movil[0] - nodos[i, 0]
+        dy = movil[1] - nodos[i, 1]
+        d = np.sqrt(dx * dx + dy * dy)
+        distancias_reales[i] = d
+        inv = 1.0 / d if d > 0 else 0.0
+        direcciones[i, 0] = dx * inv
+        direcciones[i, 1] = dy * inv
+
+        d_medida = d + ruido_distancia[i]
+        distancias_medidas[i] = d_medida
+        if d_medida > 0:
+            rssi[i] = potencia_tx - (perdida_ref + factor_perdida * np.log(d_medida)) + ruido_rssi[i]
+        else:
+            rssi[i] = potencia_tx
+
+        peso = 10.0 ** (rssi[i] * 0.1)
+        rx += peso * direcciones[i, 0]
+        ry += peso * direcciones[i, 1]
+
+    magnitud = np.sqrt(rx * rx + ry * ry)
+    if magnitud > 0:
+        rx /= magnitud
+        ry /= magnitud
+    return rx, ry
 
 class SimuladorTrilateracion:
     """
@@ -30,21 +85,26 @@ class SimuladorTrilateracion:
     Implementa un sistema de localización basado en distancias a nodos de referencia.
     """
     
-    def __init__(self):
-        """Inicializa el simulador con la configuración predeterminada."""
+    def __init__(self, num_nodos=8):
+        """Inicializa el simulador; por defecto con ocho nodos fijos (configuración octonodal)."""
         # Parámetros de radio para el sistema de Direction Finding
         self.frecuencia_ghz = 2.4  # Frecuencia WiFi en GHz
         self.lambda_m = (3e8) / (self.frecuencia_ghz * 1e9)  # Longitud de onda en metros
         self.separacion_lambda = 2  # Separación en múltiplos de longitud de onda (2λ)
         
-        # Calcular el radio basado en la longitud de onda deseada para los 8 nodos
-        self.radio_nodos = (self.separacion_lambda * self.lambda_m) / (2 * np.sin(np.pi / 8))
+        self.num_nodos = num_nodos  # Número de nodos fijos
+        
+        # Calcular el radio para que nodos vecinos queden separados por la distancia deseada
+        self.radio_nodos = (self.separacion_lambda * self.lambda_m) / (2 * np.sin(np.pi / self.num_nodos))
         self.centro_nodos = np.array([0, 0])  # Centro del círculo de nodos fijos
-        self.num_nodos = 8  # Número de nodos fijos
         
         # Generar las posiciones de los nodos fijos en círculo
         self.nodos_fijos = self.generar_nodos_circulares()
         
+        # Coordenadas X e Y de los nodos fijos como vectores 1-D contiguos (cálculo por componentes)
+        self.nodos_x = self.nodos_fijos[:, 0].copy()
+        self.nodos_y = self.nodos_fijos[:, 1].copy()
+        
         # Definir el nodo móvil (inicia más lejos del círculo)
         self.nodo_movil = np.array([self.radio_nodos * 3.0, 0])
         
@@ -53,32 +113,53 @@ class SimuladorTrilateracion:
         self.velocidad_trayectoria = 0.03
         self.centro_trayectoria = self.centro_nodos
         
-        # Historial de posiciones y distancias
-        self.distancias_historicas = {f'R{i+1}': [] for i in range(self.num_nodos)}
-        self.trayectoria_x = []
-        self.trayectoria_y = []
+        # Número de frames de la animación
+        self.max_frames = 300
+        
+        # Historial de distancias (una fila por nodo, una columna por frame)
+        self.distancias_historicas = np.empty((self.num_nodos, self.max_frames))
+        
+        # Formato de la línea de información de cada nodo (el prefijo R1..RN se arma una sola vez);
+        # con muchos nodos solo se detallan los primeros y el resto se resume en una línea
+        self.formatos_info = [f'R{i+1}: {{:.2f}} m | RSSI: {{:.1f}} dBm | ({{:.2f}}, {{:.2f}})'
+                              for i in range(min(self.num_nodos, MAX_NODOS_DETALLE))]
+        nodos_ocultos = self.num_nodos - len(self.formatos_info)
+        self.resumen_info = [f'… {nodos_ocultos} nodos más ({self.num_nodos} en total)'] if nodos_ocultos > 0 else []
+        
+        # Trayectoria circular precalculada del nodo móvil, una fila por frame
+        self.tabla_trayectoria = self.generar_trayectoria()
         
         # Vectores de dirección y magnitudes RSSI
         self.vectores_direccion = np.zeros((self.num_nodos, 2))
         self.magnitudes_rssi = np.zeros(self.num_nodos)
         
+        # Buffers de trabajo preasignados para el cálculo de cada frame
+        self.distancias_reales = np.empty(self.num_nodos)
+        self.distancias_medidas = np.empty(self.num_nodos)
+        
         # Parámetros para el modelo de pérdida de trayectoria RSSI
         self.potencia_tx = 0
         self.perdida_ref = 40
         self.exponente_perdida = 2
+        # 10 * n * log10(d) = (10 * n / ln 10) * ln(d): constante precalculada para el cálculo del RSSI
+        self.factor_perdida = 10 * self.exponente_perdida / np.log(10.0)
         
         # Error de medición para simular ruido en las distancias
         self.error_medicion = 0.2
         
+        # Generador aleatorio (PCG64) para el ruido de distancias, RSSI y sensores
+        self.rng = np.random.default_rng(42)
+        
         # Para visualización selectiva de elementos
         self.mostrar_vectores = True
         self.mostrar_trayectoria = True
         
         # Generar señales simuladas para el acelerómetro y el giroscopio
-        np.random.seed(42)
-        self.max_frames = 300
-        self.acelerometro = 0.5 * np.cumsum(np.random.randn(3, self.max_frames), axis=1)
-        self.giroscopio = 0.3 * np.cumsum(np.random.randn(3, self.max_frames), axis=1)
+        self.acelerometro = 0.5 * np.cumsum(self.rng.standard_normal((3, self.max_frames)), axis=1)
+        self.giroscopio = 0.3 * np.cumsum(self.rng.standard_normal((3, self.max_frames)), axis=1)
+        
+        # Eje temporal completo de los sensores (cada frame usa una vista, sin reasignar)
+        self.tiempo = np.arange(self.max_frames)
         
         # Colores para los sensores
         self.colores_sensores = {
@@ -100,35 +181,57 @@ class SimuladorTrilateracion:
         y = self.centro_nodos[1] + self.radio_nodos * np.sin(angulos)
         return np.column_stack((x, y))
     
-    def calcular_distancia(self, p1, p2):
-        """Calcula la distancia euclidiana entre dos puntos 2D."""
-        return np.sqrt(np.sum((p1 - p2)**2))
+    def generar_trayectoria(self):
+        """Precalcula las posiciones del nodo móvil en su trayectoria circular."""
+        fase = np.arange(self.max_frames) * self.velocidad_trayectoria
+        tabla = np.empty((self.max_frames, 2))
+        tabla[:, 0] = self.centro_trayectoria[0] + self.radio_trayectoria * np.sin(fase)
+        tabla[:, 1] = self.centro_trayectoria[1] + self.radio_trayectoria * np.cos(fase)
+        return tabla
     
-    def calcular_vector_direccion(self, origen, destino):
-        """Calcula el vector de dirección normalizado desde origen hacia destino."""
-        vector = destino - origen
-        magnitud = np.linalg.norm(vector)
-        if magnitud > 0:
-            vector_normalizado = vector / magnitud
-        else:
-            vector_normalizado = np.array([0, 0])
-        return vector_normalizado, magnitud
-    
-    def calcular_rssi(self, distancia):
-        """Calcula el RSSI basado en un modelo de pérdida de trayectoria."""
-        if distancia > 0:
-            rssi = self.potencia_tx - (self.perdida_ref + 10 * self.exponente_perdida * np.log10(distancia))
-            rssi += np.random.normal(0, 2)
-        else:
-            rssi = self.potencia_tx
-        return rssi
+    def calcular_rssi(self, distancias):
+        """Calcula el RSSI de todos los nodos basado en un modelo de pérdida de trayectoria."""
+        validas = distancias > 0
+        perdida = self.perdida_ref + self.factor_perdida * np.log(np.where(validas, distancias, 1.0))
+        rssi = self.potencia_tx - perdida + self.rng.normal(0, 2, size=distancias.shape)
+        return np.where(validas, rssi, self.potencia_tx)
 
+    def calcular_mediciones(self):
+        """Calcula distancias, vectores de dirección, RSSI y el vector resultante del frame actual."""
+        if NUMBA_DISPONIBLE and self.num_nodos >= MIN_NODOS_NUMBA:
+            # Muchos nodos: núcleo compilado que hace todo en una sola pasada sin temporales
+            ruido_distancia = self.rng.standard_normal(self.num_nodos) * self.error_medicion
+            ruido_rssi = self.rng.normal(0, 2, size=self.num_nodos)
+            rx, ry = _nucleo_direction_finding(
+                self.nodos_fijos, self.nodo_movil, ruido_distancia, ruido_rssi,
+                self.potencia_tx, self.perdida_ref, self.factor_perdida,
+                self.distancias_reales, self.distancias_medidas,
+                self.vectores_direccion, self.magnitudes_rssi)
+            return self.distancias_medidas, np.array([rx, ry])
+        
+        # Todas las distancias por componentes X/Y (pocos nodos: operaciones simples sin ejes)
+        dx = self.nodos_x - self.nodo_movil[0]
+        dy = self.nodos_y - self.nodo_movil[1]
+        distancias_reales = np.sqrt(dx*dx + dy*dy, out=self.distancias_reales)
+        distancias_medidas = np.add(distancias_reales,
+                                    self.rng.standard_normal(self.num_nodos) * self.error_medicion,
+                                    out=self.distancias_medidas)
+        
+        # Vectores de dirección nodo fijo -> nodo móvil (-dx, -dy), normalizados con las distancias ya calculadas
+        # (si la distancia es 0, dx y dy también lo son y el vector queda en cero)
+        inv = 1.0 / np.maximum(distancias_reales, 1e-12)
+        self.vectores_direccion[:, 0] = -dx * inv
+        self.vectores_direccion[:, 1] = -dy * inv
+        
+        # RSSI (ruido incluido) en un solo paso vectorizado
+        self.magnitudes_rssi[:] = self.calcular_rssi(distancias_medidas)
+        
+        return distancias_medidas, self.calcular_vector_resultante(self.vectores_direccion, self.magnitudes_rssi)
+        
     def calcular_vector_resultante(self, vectores, pesos):
         """Calcula el vector resultante ponderado basado en los vectores y sus pesos."""
-        pesos_lineales = np.power(10, pesos/10)
-        resultante = np.zeros(2)
-        for i, vector in enumerate(vectores):
-            resultante += vector * pesos_lineales[i]
+        pesos_lineales = 10.0 ** (pesos * 0.1)
+        resultante = pesos_lineales @ vectores
         magnitud = np.linalg.norm(resultante)
         if magnitud > 0:
             resultante /= magnitud
@@ -174,8 +277,10 @@ class SimuladorTrilateracion:
         self.ax_main.scatter(self.nodos_fijos[:, 0], self.nodos_fijos[:, 1], 
                            color='red', label='Nodos Fijos', s=100, zorder=10)
         
-        # Etiquetas de nodos
-        for i, nodo_fijo in enumerate(self.nodos_fijos):
+        # Etiquetas de nodos (con un anillo denso solo se etiqueta uno de cada paso_etiquetas)
+        paso_etiquetas = -(-self.num_nodos // MAX_NODOS_DETALLE)
+        for i in range(0, self.num_nodos, paso_etiquetas):
+            nodo_fijo = self.nodos_fijos[i]
             angulo = 2 * np.pi * i / self.num_nodos
             dx = (self.radio_nodos * 0.25) * np.cos(angulo)
             dy = (self.radio_nodos * 0.25) * np.sin(angulo)
@@ -184,14 +289,15 @@ class SimuladorTrilateracion:
                             fontsize=8, ha="center", va="center",
                             bbox=dict(facecolor='white', alpha=0.7))
         
-        # Nodo móvil
-        self.nodo_movil_plot, = self.ax_main.plot([], [], 'bo', 
-                                                label='Nodo Móvil Real', 
-                                                markersize=12, zorder=5)
+        # Nodo móvil (scatter de un punto: se mueve con set_offsets)
+        self.nodo_movil_plot = self.ax_main.scatter([0], [0], c='b', s=144, zorder=5,
+                                                    label='Nodo Móvil Real')
         
-        # Vectores de distancia
-        self.vectores = [self.ax_main.plot([], [], 'k--', alpha=0.3)[0] 
-                        for _ in range(self.num_nodos)]
+        # Vectores de distancia: un solo artista con un segmento (nodo fijo -> móvil) por nodo
+        self.segmentos_vectores = np.empty((self.num_nodos, 2, 2))
+        self.segmentos_vectores[:, 0] = self.nodos_fijos
+        self.vectores = LineCollection([], colors='k', linestyles='--', alpha=0.3)
+        self.ax_main.add_collection(self.vectores)
         
         # Trayectoria real
         self.trayectoria_real, = self.ax_main.plot([], [], 'gray', alpha=0.5, 
@@ -214,18 +320,35 @@ class SimuladorTrilateracion:
         )
         self.check_elementos.on_clicked(self.toggle_elementos)
         
-        # Forzar el dibujado inicial
-        self.fig.canvas.draw()
+        # Barra espaciadora para pausar/reanudar la animación
+        self.fig.canvas.mpl_connect('key_press_event', self.tecla_presionada)
+        
+        # Artistas dinámicos (los únicos que se redibujan con blit; el resto queda en el fondo)
+        self.elementos_actuales = [self.nodo_movil_plot,
+                                 self.trayectoria_real, self.vectores,
+                                 *self.acelerometro_plots, *self.giroscopio_plots,
+                                 self.texto_info_plot]
+        
+        # Solicitar el dibujado inicial (una sola vez; después se usa blit)
+        self.fig.canvas.draw_idle()
     
     def configurar_subplot_distancias(self):
         """Configura el subplot de distancias."""
         self.ax_right1.axis('off')
         self.ax_right1.set_title('Distancias y RSSI a Nodos', fontsize=10)
+        
+        # Texto de información (se actualiza en cada frame con set_text)
+        self.texto_info_plot = self.ax_right1.text(0.05, 0.95, '', 
+                                                 fontsize=8, verticalalignment='top',
+                                                 transform=self.ax_right1.transAxes,
+                                                 bbox=dict(boxstyle="round,pad=0.3", 
+                                                         fc="white", ec="gray", alpha=0.7))
     
     def configurar_subplot_acelerometro(self):
         """Configura el subplot del acelerómetro."""
-        self.ax_right2.set_xlim(0, 100)
-        self.ax_right2.set_ylim(-5, 5)
+        # Límites fijos a partir de las señales precalculadas (sin autoescalar en cada frame)
+        self.ax_right2.set_xlim(0, self.max_frames)
+        self.ax_right2.set_ylim(self.acelerometro.min() - 0.5, self.acelerometro.max() + 0.5)
         self.ax_right2.set_title('Acelerómetro (m/s²)', fontsize=10)
         self.ax_right2.set_xlabel('Tiempo (s)', fontsize=8)
         self.ax_right2.grid(True, alpha=0.3)
@@ -241,8 +364,9 @@ class SimuladorTrilateracion:
     
     def configurar_subplot_giroscopio(self):
         """Configura el subplot del giroscopio."""
-        self.ax_right3.set_xlim(0, 100)
-        self.ax_right3.set_ylim(-5, 5)
+        # Límites fijos a partir de las señales precalculadas (sin autoescalar en cada frame)
+        self.ax_right3.set_xlim(0, self.max_frames)
+        self.ax_right3.set_ylim(self.giroscopio.min() - 0.5, self.giroscopio.max() + 0.5)
         self.ax_right3.set_title('Giroscopio (°/s)', fontsize=10)
         self.ax_right3.set_xlabel('Tiempo (s)', fontsize=8)
         self.ax_right3.grid(True, alpha=0.3)
@@ -263,95 +387,84 @@ class SimuladorTrilateracion:
         elif label == 'Trayectoria':
             self.mostrar_trayectoria = not self.mostrar_trayectoria
     
+    def tecla_presionada(self, event):
+        """Callback de teclado: la barra espaciadora pausa o reanuda la animación."""
+        # Ignorar otras teclas y la animación ya terminada (repeat=False libera su temporizador)
+        if event.key != ' ' or self.ani.event_source is None:
+            return
+        self.pausa = not self.pausa
+        # pause()/resume() detienen el temporizador y ajustan los artistas animados de blit
+        if self.pausa:
+            self.ani.pause()
+        else:
+            self.ani.resume()
+    
+    def inicializar_animacion(self):
+        """Deja los artistas dinámicos en su estado inicial para que blit capture solo el fondo estático."""
+        self.nodo_movil_plot.set_offsets(self.tabla_trayectoria[:1])
+        self.vectores.set_segments([])
+        self.trayectoria_real.set_data([], [])
+        for linea in (*self.acelerometro_plots, *self.giroscopio_plots):
+            linea.set_data([], [])
+        self.texto_info_plot.set_text('')
+        return self.elementos_actuales
+    
     def actualizar_frame(self, frame):
         """Actualiza la animación."""
+        # Salvaguarda: en pausa el temporizador está detenido y no debería llegar aquí
         if self.pausa:
             return self.elementos_actuales
         
-        # Mover el nodo móvil
-        self.nodo_movil[0] = self.centro_trayectoria[0] + self.radio_trayectoria * np.sin(frame * self.velocidad_trayectoria)
-        self.nodo_movil[1] = self.centro_trayectoria[1] + self.radio_trayectoria * np.cos(frame * self.velocidad_trayectoria)
+        # Mover el nodo móvil (trayectoria precalculada)
+        self.nodo_movil[:] = self.tabla_trayectoria[frame]
         
         # Actualizar posición del nodo móvil
-        self.nodo_movil_plot.set_data([self.nodo_movil[0]], [self.nodo_movil[1]])
-        
-        # Actualizar trayectoria
-        self.trayectoria_x.append(self.nodo_movil[0])
-        self.trayectoria_y.append(self.nodo_movil[1])
+        self.nodo_movil_plot.set_offsets(self.nodo_movil.reshape(1, 2))
         
-        # Calcular distancias y RSSI
-        distancias_reales = [self.calcular_distancia(self.nodo_movil, nodo_fijo) for nodo_fijo in self.nodos_fijos]
-        distancias_medidas = [d + np.random.normal(0, self.error_medicion) for d in distancias_reales]
-        
-        # Actualizar vectores de dirección y RSSI
-        for i, nodo_fijo in enumerate(self.nodos_fijos):
-            self.vectores_direccion[i], _ = self.calcular_vector_direccion(nodo_fijo, self.nodo_movil)
-            self.magnitudes_rssi[i] = self.calcular_rssi(distancias_medidas[i])
+        # Calcular distancias, direcciones, RSSI y vector resultante
+        distancias_medidas, vector_resultante = self.calcular_mediciones()
         
         # Actualizar vectores de distancia
-        for i, nodo_fijo in enumerate(self.nodos_fijos):
-            if self.mostrar_vectores:
-                self.vectores[i].set_data([nodo_fijo[0], self.nodo_movil[0]], 
-                                        [nodo_fijo[1], self.nodo_movil[1]])
-            else:
-                self.vectores[i].set_data([], [])
+        if self.mostrar_vectores:
+            self.segmentos_vectores[:, 1] = self.nodo_movil
+            self.vectores.set_segments(self.segmentos_vectores)
+        else:
+            self.vectores.set_segments([])
         
         # Actualizar distancias históricas
-        for i, distancia in enumerate(distancias_medidas):
-            self.distancias_historicas[f'R{i+1}'].append(distancia)
-        
-        # Limpiar textos anteriores
-        for text in self.ax_right1.texts:
-            text.remove()
+        self.distancias_historicas[:, frame] = distancias_medidas
         
-        # Calcular vector resultante y ángulo
-        vector_resultante = self.calcular_vector_resultante(self.vectores_direccion, self.magnitudes_rssi)
-        angulo_resultante = np.arctan2(vector_resultante[1], vector_resultante[0]) * 180 / np.pi
+        # Calcular ángulo del vector resultante
+        angulo_resultante = math.degrees(math.atan2(float(vector_resultante[1]), float(vector_resultante[0])))
         
-        # Crear texto de información
-        texto_distancias = ''
-        for i, (distancia, rssi) in enumerate(zip(distancias_medidas, self.magnitudes_rssi)):
-            texto_distancias += f'R{i+1}: {distancia:.2f} m | RSSI: {rssi:.1f} dBm | ({self.vectores_direccion[i][0]:.2f}, {self.vectores_direccion[i][1]:.2f})\n'
-        
-        texto_info = f'\nNodo móvil: ({self.nodo_movil[0]:.2f}, {self.nodo_movil[1]:.2f})\n'
-        texto_info += f'Vector de dirección: [{vector_resultante[0]:.2f}, {vector_resultante[1]:.2f}]\n'
-        texto_info += f'Ángulo: {angulo_resultante:.1f}°'
+        # Crear texto de información (una línea por nodo y un resumen, unidas una sola vez)
+        lineas = [formato.format(distancia, rssi, vx, vy)
+                  for formato, distancia, rssi, (vx, vy) in zip(self.formatos_info, distancias_medidas,
+                                                                self.magnitudes_rssi, self.vectores_direccion)]
+        lineas += self.resumen_info
+        lineas += ['',
+                   f'Nodo móvil: ({self.nodo_movil[0]:.2f}, {self.nodo_movil[1]:.2f})',
+                   f'Vector de dirección: [{vector_resultante[0]:.2f}, {vector_resultante[1]:.2f}]',
+                   f'Ángulo: {angulo_resultante:.1f}°']
         
         # Mostrar texto actualizado
-        texto = self.ax_right1.text(0.05, 0.95, texto_distancias + texto_info, 
-                                  fontsize=8, verticalalignment='top',
-                                  transform=self.ax_right1.transAxes,
-                                  bbox=dict(boxstyle="round,pad=0.3", 
-                                          fc="white", ec="gray", alpha=0.7))
+        self.texto_info_plot.set_text('\n'.join(lineas))
         
         # Actualizar trayectoria
         max_puntos = 200
         if self.mostrar_trayectoria:
-            self.trayectoria_real.set_data(self.trayectoria_x[-max_puntos:], 
-                                         self.trayectoria_y[-max_puntos:])
+            inicio = max(0, frame + 1 - max_puntos)
+            self.trayectoria_real.set_data(self.tabla_trayectoria[inicio:frame + 1, 0], 
+                                         self.tabla_trayectoria[inicio:frame + 1, 1])
         else:
             self.trayectoria_real.set_data([], [])
         
         # Actualizar sensores
         if frame > 0:
-            tiempo = np.arange(frame + 1)
+            tiempo = self.tiempo[:frame + 1]
             for i in range(3):
                 self.acelerometro_plots[i].set_data(tiempo, self.acelerometro[i, :frame+1])
                 self.giroscopio_plots[i].set_data(tiempo, self.giroscopio[i, :frame+1])
-            
-            self.ax_right2.relim()
-            self.ax_right2.autoscale_view()
-            self.ax_right3.relim()
-            self.ax_right3.autoscale_view()
-        
-        # Forzar actualización del canvas
-        self.fig.canvas.draw()
-        
-        # Guardar elementos actuales
-        self.elementos_actuales = [self.nodo_movil_plot,
-                                 self.trayectoria_real, *self.vectores,
-                                 *self.acelerometro_plots, *self.giroscopio_plots,
-                                 texto]
         
         return self.elementos_actuales
     
@@ -360,6 +473,7 @@ class SimuladorTrilateracion:
         self.ani = animation.FuncAnimation(
             self.fig, self.actualizar_frame, 
             frames=self.max_frames, interval=100,
+            init_func=self.inicializar_animacion,
             blit=True,
             repeat=False,
             cache_frame_data=False
@@ -369,12 +483,26 @@ class SimuladorTrilateracion:
         plt.show()
 
 def main():
-    """Función principal para iniciar el simulador."""
+    """Función principal para iniciar el simulador.
+
+    Uso: python simulador_octonodo_DF.py [num_nodos]  (por defecto 8, mínimo 3)
+    """
+    uso = "Uso: python simulador_octonodo_DF.py [num_nodos]  (num_nodos entero >= 3, por defecto 8)"
+    try:
+        num_nodos = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    except ValueError:
+        sys.exit(uso)
+    # Con menos de 3 nodos no hay anillo (el radio diverge o la división es por cero)
+    if num_nodos < 3:
+        sys.exit(uso)
+    
     print("Iniciando Simulador de Trilateración - Configuración Octonodal (Sin Estimación)...")
+    print(f"Nodos fijos: {num_nodos}")
     print("Controles disponibles:")
     print("- Casillas para mostrar/ocultar elementos visuales")
+    print("- Barra espaciadora para pausar/reanudar la animación")
     
-    simulador = SimuladorTrilateracion()
+    simulador = SimuladorTrilateracion(num_nodos)
     simulador.iniciar_animacion()
 
 if __name__ == "__main__":